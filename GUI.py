@@ -524,7 +524,7 @@ class LibraryScraperGUI:
             # Cleanup
             if scraper:
                 try:
-                    scraper.driver_pool.cleanup()
+                    scraper.cleanup()
                 except Exception as e:
                     print(f"Error during cleanup: {str(e)}")
             
@@ -537,7 +537,7 @@ class LibraryScraperGUI:
             # Ensure cleanup happens even on error
             if scraper:
                 try:
-                    scraper.driver_pool.cleanup()
+                    scraper.cleanup()
                 except:
                     pass
             if self.is_running:
@@ -0,0 +1,16 @@
+"""HTTP client shared by every scraper in the process"""
+import atexit
+import httpx
+
+# One HTTP/2 connection pool for all scrapers, so catalogs fronted by the same CDN reuse
+# connections. Headers differ per library, so scrapers pass theirs on each request.
+SHARED_CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_keepalive_connections=32)
+    ),
+    follow_redirects=True
+)
+
+atexit.register(SHARED_CLIENT.close)
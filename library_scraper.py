@@ -4,7 +4,13 @@ import re
 import csv
 from urllib.parse import quote
 from bs4 import BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # selectolax is optional here; parse_search_results falls back to BeautifulSoup
+    LexborHTMLParser = None
 import json
+from operator import itemgetter
 from dataclasses import dataclass
 from typing import List, Optional
 from selenium import webdriver
@@ -81,7 +87,7 @@ class GoodreadsExtractor:
         # Implementation depends on current Goodreads HTML structure
         base_url = f"https://www.goodreads.com/review/list/{user_id}?shelf=to-read"
         response = requests.get(base_url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         books = []
         for book in soup.find_all('div', class_='bookalike'):
             title = book.find('h3', class_='bookTitle').text.strip()
@@ -92,8 +98,10 @@ class GoodreadsExtractor:
        
 
 class PBCLibraryScraper:
-    def __init__(self):
+    def __init__(self, fast_parser=True):
         self.base_url = "https://pbclibrary.bibliocommons.com/v2/search"
+        # Parse search results with selectolax's lexbor backend when it is installed
+        self.fast_parser = fast_parser and LexborHTMLParser is not None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -145,33 +153,32 @@ class PBCLibraryScraper:
     
     def parse_search_results(self, html_content, original_book: Book):
         """Parse the search results HTML to extract availability info"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         results = []
         
         # Look for book items in the search results
         # The exact selectors may need adjustment based on the actual HTML structure
-        book_items = soup.find('div', class_='cp-search-result-item-content')
+        book_items = self._select(self._parse_html(html_content), 'div.cp-search-result-item-content')
+        
         if book_items:
             try:
                     # Extract book title
-                title_elem = book_items.find('span', class_='title-content')
-                book_title = title_elem.get_text(strip=True) if title_elem else "Unknown"
+                title_elem = self._select(book_items, 'span.title-content')
+                book_title = self._text(title_elem, strip=True) if title_elem else "Unknown"
 
              
                 # Extract author
-                author_elem = book_items.find('span', class_='cp-author-link')
-                book_author = author_elem.get_text(strip=True) if author_elem else "Unknown"
+                author_elem = self._select(book_items, 'span.cp-author-link')
+                book_author = self._text(author_elem, strip=True) if author_elem else "Unknown"
                 if book_author != "Unknown" and ', ' in book_author:
                     # Change to First Last format
                         last_name, first_name = book_author.split(', ', 1)
                         book_author =  f"{first_name} {last_name}"
                 
                 # Extract availability information
-                availability_elem = book_items.find('span', class_='cp-availability-status')
+                availability_elem = self._select(book_items, 'span.cp-availability-status')
                 availability = "Available"
                 if availability_elem:
-                    text = availability_elem.get_text().strip()
+                    text = self._text(availability_elem).strip()
                     if text == "Available":
                         availability = "Available"
                     elif text == "All copies in use":
@@ -180,12 +187,12 @@ class PBCLibraryScraper:
                         availability = "Unknown"  # Handle other cases
                     
                 # Extract format information
-                format_elem = book_items.find('li', class_='bib-field-value')
-                book_format = format_elem.get_text(strip=True) if format_elem else "Unknown"
+                format_elem = self._select(book_items, 'li.bib-field-value')
+                book_format = self._text(format_elem, strip=True) if format_elem else "Unknown"
                     
                 # Extract link to detailed view
-                link_elem = book_items.find('a', href=True)
-                detail_link = link_elem['href'] if link_elem else None
+                link_elem = self._select(book_items, 'a[href]')
+                detail_link = self._href(link_elem) if link_elem else None
                 if detail_link and not detail_link.startswith('http'):
                     detail_link = f"https://pbclibrary.bibliocommons.com{detail_link}"
                         
@@ -205,6 +212,30 @@ class PBCLibraryScraper:
         
         return results
     
+    def _parse_html(self, html_content):
+        """Parse a page with whichever backend this scraper was set up to use"""
+        if self.fast_parser:
+            return LexborHTMLParser(html_content)
+        return BeautifulSoup(html_content, 'lxml')
+    
+    def _select(self, root, selector):
+        """First element under root matching a CSS selector, or None"""
+        if self.fast_parser:
+            return root.css_first(selector)
+        return root.select_one(selector)
+    
+    def _text(self, elem, strip=False):
+        """Text content of an element from either backend"""
+        if self.fast_parser:
+            return elem.text(strip=strip)
+        return elem.get_text(strip=strip)
+    
+    def _href(self, elem):
+        """href attribute of an element from either backend"""
+        if self.fast_parser:
+            return elem.attributes['href']
+        return elem['href']
+    
     def setup_selenium(self):
         # Setup driver
         try:
@@ -414,8 +445,7 @@ if __name__ == "__main__":
                 print(f"Link: {result['detail_link']}")
             if result['branch_availability']:
                 print("Branch availability:")
-                for branch in result['branch_availability']:
-                    print(f"Branch: {branch['branch']}")
+                print("\n".join(["Branch: " + b['branch'] for b in result['branch_availability']]))
         else:
             print("❌ Not found in library system")
     
@@ -424,7 +454,7 @@ if __name__ == "__main__":
         json.dump(results, f, indent=2)
     
     print(f"\n✅ Results saved to library_availability.json")
-    print(f"📚 Checked {len(books)} books, found {len([r for r in results if r['found_title']])} matches")
+    print(f"📚 Checked {len(books)} books, found {sum(map(bool, map(itemgetter('found_title'), results)))} matches")
     
     end_time = time.time()
     execution_time = end_time - start_time
@@ -1,11 +1,21 @@
+import asyncio
+import functools
 import html
-import requests
+import os
+import sys
+import argparse
+import logging
+import logging.handlers
+import httpx
 import time
 import re
+import shelve
 import csv
-from urllib.parse import quote
-from bs4 import BeautifulSoup
-import json
+from urllib.parse import quote, urlencode
+import lxml.html
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
+import orjson
 from dataclasses import dataclass
 from typing import List, Optional
 from selenium import webdriver
@@ -13,11 +23,23 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import threading
-from queue import Queue
+from queue import Queue, Empty
+from collections import OrderedDict
 from abc import ABC, abstractmethod
 import webbrowser
+from _net import SHARED_CLIENT
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.compute as pc
+except ImportError:
+    # pyarrow is optional; load_from_csv falls back to the csv module
+    pa = None
+
+logger = logging.getLogger(__name__)
 
 
 '''
@@ -25,6 +47,106 @@ Multithreaded version of app.py
 Much faster execution time 
 
 '''
+
+# BiblioCommons record id inside a detail link, e.g. /v2/record/S40C1234567
+_BIB_ID_RE = re.compile(r'/record/([A-Za-z0-9]+)')
+# Parenthesised notes such as series names, dropped by clean_title
+_PARENS_RE = re.compile(r"\s*\(.*?\)")
+# Classifies ACLD availability text in one match; alternatives are tried in order, so a bare
+# count wins, then "available" anywhere, then "unavailable"/"checked out", then any number
+_AVAIL_CLASSIFY_RE = re.compile(
+    r'^(?:(?P<count>\d+)\Z'
+    r'|(?=.*?(?P<avail>available))'
+    r'|(?=.*?(?P<unavail>unavailable|checked out))'
+    r'|\D*(?P<number>\d+))',
+    re.IGNORECASE | re.DOTALL
+)
+# Words that mark an ACLD holdings row without a count as a branch name
+_BRANCH_KEYWORDS = ('library', 'branch', 'center')
+# Common Alachua County library branch names, looked for in the page text when no holdings rows parse
+_ALACHUA_BRANCHES = (
+    'Headquarters Library',
+    'Millhopper Branch Library',
+    'Tower Road Branch Library',
+    'High Springs Branch Library',
+    'Newberry Branch Library',
+    'Hawthorne Branch Library',
+    'Cone Park Branch Library',
+    'Alachua Branch Library'
+)
+_ALACHUA_BRANCH_RE = re.compile('|'.join(map(re.escape, _ALACHUA_BRANCHES)), re.IGNORECASE)
+# ACLD holdings row suffix, e.g. "Millhopper Branch Library (2 of 3 available)"
+_AVAIL_PAREN_RE = re.compile(r'\((\d+) of \d+ available\)')
+_AVAIL_PAREN_SUB_RE = re.compile(r'\s*\(\d+ of \d+ available\)')
+# JSON endpoint the BiblioCommons record page calls to fill in its availability table
+_PBC_AVAILABILITY_URL = "https://gateway.bibliocommons.com/v2/libraries/pbclibrary/bibs/{}/availability"
+# Branch lines in the PBC availability table, tried in order:
+#   standard branch/library names (ends with BRANCH or LIBRARY),
+#   special services like BOOKS BY MAIL or BOOKMOBILE,
+#   any all-caps line that mentions a library-related keyword
+_BRANCH_RE = re.compile(
+    r'^(?:(?P<branch>[A-Z][A-Z\s\-\.]+(?:BRANCH|LIBRARY))(?:\s*-\s*[A-Za-z\s]+)?'
+    r'|(?P<service>[A-Z][A-Z\s\-\.]+(?:BOOKS BY MAIL|BOOKMOBILE|MAIL|MOBILE))(?:\s*-\s*[A-Za-z\s]+)?'
+    r'|(?P<line>(?=[A-Z\s\-\.]*(?:BRANCH|LIBRARY|BOOKS|MAIL|MOBILE))[A-Z][A-Z\s\-\.]+))$'
+)
+# Substitutions applied by AlachuaCountyLibraryScraper.clean_title_text, compiled once
+_CLEAN_PATTERNS = [(re.compile(pattern), replacement) for pattern, replacement in [
+    # Fix common word boundaries: camelCase, letter->number and number->letter in one pass
+    (r'(?<=[a-z])(?=[A-Z\d])|(?<=\d)(?=[A-Za-z])', ' '),
+    
+    # Fix specific common patterns
+    (r'Beforethe', 'Before the'),
+    (r'Beforewe', 'Before we'),
+    (r'Beforecoffee', 'Before coffee'),
+    (r'Beforeforget', 'Before forget'),
+    (r'Beforegoodbye', 'Before goodbye'),
+    (r'Beforekindness', 'Before kindness'),
+    (r'Beforethecoffeegetscold', 'Before the coffee gets cold'),
+    (r'Beforewesaygoodbye', 'Before we say goodbye'),
+    (r'Beforeweforgetkindness', 'Before we forget kindness'),
+    
+    # Fix other common patterns
+    (r'([a-z])([A-Z][a-z])', r'\1 \2'),  # More camelCase fixes
+    (r'([a-z])([A-Z]{2,})', r'\1 \2'),   # Fix ALL CAPS words
+    
+    # Clean up multiple spaces
+    (r'\s+', ' '),
+]]
+# Words clean_title_text keeps lowercase unless they start the title
+_LOWERCASE_WORDS = frozenset(['a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'up', 'with'])
+# Where search results are kept between runs
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "library_checker")
+# Resources the scrapers never read; Chrome is told not to fetch them at all
+_BLOCKED_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.woff*', '*.svg', '*.css',
+                 '*analytics*', '*googletag*', '*doubleclick*']
+# ACLD detail pages: Selenium's page_source is re-encoded as UTF-8 whatever the page declares
+_ACLD_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+# Holdings rows of an ACLD detail page, i.e. tr.location
+_ACLD_LOCATION_XPATH = etree.XPath("//tr[contains(concat(' ', normalize-space(@class), ' '), ' location ')]")
+# Most detail pages get_branch_availability_batch keeps open as tabs in one driver
+_MAX_TABS = 8
+# Seconds to wait before each repeat availability poll of a result that is still loading
+_POLL_BACKOFF = (0.5, 1, 2)
+
+# Flags window.__ajaxDone once the Polaris availability loaders have been
+# swapped out for real availability rows
+_AJAX_DONE_JS = """
+window.__ajaxDone = false;
+var pending = function () {
+    return document.querySelector("img[src*='ajax-loader']") !== null;
+};
+if (!pending()) {
+    window.__ajaxDone = true;
+} else {
+    new MutationObserver(function (mutations, observer) {
+        if (!pending()) {
+            window.__ajaxDone = true;
+            observer.disconnect();
+        }
+    }).observe(document.body, {childList: true, subtree: true, attributes: true});
+}
+"""
+
 @dataclass
 class Book:
     """Represents a book with its metadata"""
@@ -40,11 +162,30 @@ class GoodreadsExtractor:
     """Handles extraction of books from Goodreads"""
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = SHARED_CLIENT
         # Add headers to appear more like a regular browser
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
+    
+    # Goodreads export columns needed to build a Book
+    csv_columns = ['Title', 'Author', 'ISBN13', 'ISBN', 'Book Id', 'Exclusive Shelf']
+    
+    def load_table(self, csv_file_path: str):
+        """
+        Load the "Want to Read" rows of a Goodreads CSV export as a pyarrow Table
+        Only the columns in csv_columns are parsed, all as strings
+        """
+        convert_options = pv.ConvertOptions(
+            include_columns=self.csv_columns,
+            include_missing_columns=True,
+            column_types={column: pa.string() for column in self.csv_columns}
+        )
+        # Review and notes cells can span several lines
+        parse_options = pv.ParseOptions(newlines_in_values=True)
+        table = pv.read_csv(csv_file_path, parse_options=parse_options, convert_options=convert_options)
+        shelf = pc.fill_null(table['Exclusive Shelf'], '')
+        return table.filter(pc.equal(pc.utf8_lower(shelf), 'to-read'))
     
     def load_from_csv(self, csv_file_path: str) -> List[Book]:
         """
@@ -53,18 +194,26 @@ class GoodreadsExtractor:
         """
         books = []
         try:
-            with open(csv_file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Filter for "Want to Read" shelf
-                    if row.get('Exclusive Shelf', '').lower() == 'to-read':
-                        book = Book(
-                            title=row.get('Title', ''),
-                            author=row.get('Author', ''),
-                            isbn=row.get('ISBN13', '') or row.get('ISBN', ''),
-                            goodreads_id=row.get('Book Id', '')
-                        )
-                        books.append(book)
+            if pa is not None:
+                columns = self.load_table(csv_file_path).to_pydict()
+                books = [
+                    Book(title=title or '', author=author or '', isbn=isbn13 or isbn or '', goodreads_id=book_id or '')
+                    for title, author, isbn13, isbn, book_id in zip(
+                        columns['Title'], columns['Author'], columns['ISBN13'], columns['ISBN'], columns['Book Id'])
+                ]
+            else:
+                with open(csv_file_path, 'r', encoding='utf-8') as file:
+                    reader = csv.DictReader(file)
+                    for row in reader:
+                        # Filter for "Want to Read" shelf
+                        if row.get('Exclusive Shelf', '').lower() == 'to-read':
+                            book = Book(
+                                title=row.get('Title', ''),
+                                author=row.get('Author', ''),
+                                isbn=row.get('ISBN13', '') or row.get('ISBN', ''),
+                                goodreads_id=row.get('Book Id', '')
+                            )
+                            books.append(book)
         except FileNotFoundError:
             print(f"CSV file not found: {csv_file_path}")
             print("Export your Goodreads library from: Settings > Import/Export")
@@ -82,20 +231,17 @@ class GoodreadsExtractor:
         
 
 class ThreadSafeSeleniumPool:
-    """Thread-safe pool of Selenium WebDriver instances"""
+    """Thread-safe pool of Selenium WebDriver instances, created on first use"""
     
-    def __init__(self, pool_size: int = 3):
+    def __init__(self, pool_size: int = 3, idle_timeout: float = 60, warmup_url: Optional[str] = None):
         self.pool_size = pool_size
-        self.drivers = Queue()
+        self.warmup_url = warmup_url  # Page each new driver loads once so later visits hit a warm cache
+        self.idle_timeout = idle_timeout  # Seconds an unused driver is kept before it is quit
+        self.drivers = Queue()  # Idle (driver, last_used) pairs
         self.lock = threading.Lock()
-        self._initialize_drivers()
-    
-    def _initialize_drivers(self):
-        """Initialize the driver pool"""
-        for _ in range(self.pool_size):
-            driver = self._create_driver()
-            if driver:
-                self.drivers.put(driver)
+        self._created = 0
+        self._stop_reaper = threading.Event()
+        self._reaper = None
     
     def _create_driver(self):
         """Create a new WebDriver instance"""
@@ -124,47 +270,201 @@ class ThreadSafeSeleniumPool:
             chrome_options.add_argument('--silent')
             chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
             
-            return webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
+            self._warm_up(driver)
+            return driver
         except Exception as e:
             print(f"Error creating WebDriver: {e}")
             return None
     
+    def _warm_up(self, driver):
+        """Keep the HTTP cache on, block unneeded resources and load the catalog once so later navigations reuse it"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URLS})
+            if self.warmup_url:
+                driver.get(self.warmup_url)
+        except Exception as e:
+            print(f"WebDriver warm-up failed: {e}")
+    
+    def _new_driver(self):
+        """Create a driver whose slot was already counted in _created, releasing the slot on failure"""
+        driver = self._create_driver()
+        if driver:
+            self._start_reaper()
+        else:
+            with self.lock:
+                self._created -= 1
+        return driver
+    
     def get_driver(self):
-        """Get a driver from the pool"""
+        """Get a driver from the pool, starting one only when none are idle"""
+        try:
+            return self.drivers.get_nowait()[0]
+        except Empty:
+            pass
+        
+        # Check and claim a slot together so concurrent callers cannot overshoot pool_size
+        with self.lock:
+            can_create = self._created < self.pool_size
+            if can_create:
+                self._created += 1
+        if can_create:
+            return self._new_driver()
+        
         try:
-            return self.drivers.get(timeout=30)  # Wait up to 30 seconds
-        except:
+            return self.drivers.get(timeout=30)[0]  # Wait up to 30 seconds
+        except Empty:
             # If no driver available, create a new one
-            return self._create_driver()
+            with self.lock:
+                self._created += 1
+            return self._new_driver()
     
     def return_driver(self, driver):
         """Return a driver to the pool"""
         if driver:
-            self.drivers.put(driver)
+            self.drivers.put((driver, time.time()))
+    
+    def discard_driver(self, driver):
+        """Quit a broken driver instead of returning it, freeing its slot in the pool"""
+        if driver:
+            with self.lock:
+                self._created -= 1
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
+    def _start_reaper(self):
+        """Start the idle-driver reaper thread if it is not running yet"""
+        with self.lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_idle_drivers, daemon=True)
+                self._reaper.start()
+    
+    def _reap_idle_drivers(self):
+        """Quit drivers that have been sitting unused for longer than idle_timeout"""
+        while not self._stop_reaper.wait(self.idle_timeout / 2):
+            now = time.time()
+            keep = []
+            while True:
+                try:
+                    driver, last_used = self.drivers.get_nowait()
+                except Empty:
+                    break
+                if now - last_used > self.idle_timeout:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    with self.lock:
+                        self._created -= 1
+                else:
+                    keep.append((driver, last_used))
+            for item in keep:
+                self.drivers.put(item)
     
     def cleanup(self):
         """Clean up all drivers in the pool"""
-        while not self.drivers.empty():
+        self._stop_reaper.set()
+        while True:
+            try:
+                driver, _ = self.drivers.get_nowait()
+            except Empty:
+                break
+            with self.lock:
+                self._created -= 1
             try:
-                driver = self.drivers.get_nowait()
                 driver.quit()
             except:
                 pass
 
+class TokenBucket:
+    """Rate limiter that hands out one request token every `interval` seconds
+
+    A background thread refills the bucket, so waiting callers never hold a lock and
+    up to `capacity` tokens can build up while workers are busy parsing. Each calling
+    thread is also kept at least `spacing` seconds apart from its own previous request.
+    """
+    
+    def __init__(self, interval: float, capacity: int, spacing: float = 0):
+        self.interval = interval
+        self.spacing = spacing
+        self._last_request = threading.local()
+        self._tokens = threading.BoundedSemaphore(capacity)  # Starts full
+        self._stopped = threading.Event()
+        self._refiller = threading.Thread(target=self._refill, daemon=True)
+        self._refiller.start()
+    
+    def _refill(self):
+        """Add one token per interval until stopped"""
+        while not self._stopped.wait(self.interval):
+            try:
+                self._tokens.release()
+            except ValueError:
+                pass  # Bucket is already full
+    
+    def acquire(self):
+        """Block until this thread's spacing has passed and a request token is available"""
+        last = getattr(self._last_request, 'time', None)
+        if last is not None:
+            remaining = last + self.spacing - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+        self._tokens.acquire()
+        self._last_request.time = time.monotonic()
+    
+    def stop(self):
+        """Stop the refill thread"""
+        self._stopped.set()
+
 class LibraryScraperBase(ABC):
-    def __init__(self, max_workers: int = 3):
+    # check_books_async runs up to max_workers * this many books at once
+    async_concurrency_factor = 1
+    # Catalog home page new Selenium drivers load once before their first real request
+    catalog_home = None
+    # Delays between repeat _poll_availability calls; empty when a repeat poll cannot see new data
+    poll_backoff = _POLL_BACKOFF
+
+    def __init__(self, max_workers: int = 3, use_cache: bool = True):
         """Initialize common attributes for all library scrapers"""
         self.max_workers = max_workers
-        self.driver_pool = ThreadSafeSeleniumPool(max_workers)
+        self.driver_pool = ThreadSafeSeleniumPool(max_workers, warmup_url=self.catalog_home)
+        
+        # Search results keyed by cleaned (title, author), persisted between runs
+        self.use_cache = use_cache
+        self.cache_ttl = 6 * 60 * 60  # Seconds before a cached search is considered stale
+        self.cache_path = os.path.join(_CACHE_DIR, f"{type(self).__name__}_search_cache.json")
+        self.cache_max_entries = 5000  # Least recently used searches are dropped past this size
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_dirty = False
+        if use_cache:
+            self._load_search_cache()
         
-        # Thread-safe session for requests
-        self.session = requests.Session()
-        self.session.headers.update(self.get_default_headers())
+        # Raw detail pages and availability responses keyed by URL, in a shelve opened on first use
+        self.page_cache_path = os.path.join(_CACHE_DIR, f"{type(self).__name__}_pages")
+        self._page_cache = None
+        self._page_cache_lock = threading.Lock()
         
-        # Rate limiting
-        self.last_request_time = {}
-        self.request_lock = threading.Lock()
-        self.min_delay = 1.5  # Minimum delay between requests in seconds
+        # Process-wide HTTP/2 client; this scraper's headers go on each request
+        self.session = SHARED_CLIENT
+        self.headers = self.get_default_headers()
+        
+        # Rate limiting: a shared token bucket paced so each worker averages one request per min_delay,
+        # and no single thread (such as the GUI's) requests more often than min_delay
+        self.rate_bucket = TokenBucket(1.5 / max_workers, capacity=max(1, min(max_workers, 4)), spacing=1.5)
+    
+    @property
+    def min_delay(self):
+        """Minimum delay between one thread's requests, in seconds"""
+        return self.rate_bucket.spacing
+    
+    @min_delay.setter
+    def min_delay(self, value):
+        self.rate_bucket.spacing = value
+        self.rate_bucket.interval = value / self.max_workers
     
     def get_default_headers(self):
         """Return default headers for HTTP requests"""
@@ -177,19 +477,111 @@ class LibraryScraperBase(ABC):
             'Upgrade-Insecure-Requests': '1'
         }
     
-    def _rate_limit(self, thread_id):
-        """Implement rate limiting per thread"""
-        with self.request_lock:
-            current_time = time.time()
-            if thread_id in self.last_request_time:
-                time_since_last = current_time - self.last_request_time[thread_id]
-                if time_since_last < self.min_delay:
-                    time.sleep(self.min_delay - time_since_last)
-            self.last_request_time[thread_id] = time.time()
-    
-    def clean_title(self, title):
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def clean_title(title):
         """Clean book title by removing parentheses content"""
-        return re.sub(r"\s*\(.*?\)", "", title)
+        return _PARENS_RE.sub("", title)
+    
+    def search_cache_key(self, book: Book):
+        """Key used to share search results between books with the same title and author"""
+        return (self.clean_title(book.title).lower(), book.author.lower().strip())
+    
+    def get_cached_search(self, book: Book):
+        """Return cached search results for a book, or None on a miss"""
+        if not self.use_cache:
+            return None
+        key = self.search_cache_key(book)
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+            if entry:
+                self._search_cache.move_to_end(key)
+        if entry and time.time() - entry[0] < self.cache_ttl:
+            return entry[1]
+        return None
+    
+    def cache_search(self, book: Book, search_results):
+        """Remember search results for a book unless they are incomplete"""
+        if not self.use_cache or not search_results:
+            return
+        if any(result['availability'] == 'Loading' for result in search_results):
+            return
+        key = self.search_cache_key(book)
+        with self._search_cache_lock:
+            self._search_cache[key] = (time.time(), search_results)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > self.cache_max_entries:
+                self._search_cache.popitem(last=False)
+            self._search_cache_dirty = True
+    
+    def _load_search_cache(self):
+        """Load persisted search results, dropping entries that are already stale"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                entries = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable search cache {self.cache_path}: {e}")
+            return
+        
+        now = time.time()
+        for title, author, cached_at, search_results in entries[-self.cache_max_entries:]:
+            if now - cached_at < self.cache_ttl:
+                self._search_cache[(title, author)] = (cached_at, search_results)
+    
+    def save_search_cache(self):
+        """Write the search cache to disk if anything was added this run"""
+        if not self.use_cache or not self._search_cache_dirty:
+            return
+        with self._search_cache_lock:
+            entries = [[title, author, cached_at, search_results]
+                       for (title, author), (cached_at, search_results) in self._search_cache.items()]
+            self._search_cache_dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'wb') as f:
+                f.write(orjson.dumps(entries))
+        except OSError as e:
+            print(f"Could not save search cache {self.cache_path}: {e}")
+    
+    def _open_page_cache(self):
+        """Open the page cache shelf; call with _page_cache_lock held"""
+        if self._page_cache is None:
+            os.makedirs(os.path.dirname(self.page_cache_path), exist_ok=True)
+            self._page_cache = shelve.open(self.page_cache_path)
+        return self._page_cache
+    
+    def get_cached_page(self, url):
+        """Return the cached body fetched from url, or None on a miss or once it is stale"""
+        if not self.use_cache or not url:
+            return None
+        with self._page_cache_lock:
+            try:
+                entry = self._open_page_cache().get(url)
+            except Exception as e:
+                print(f"Could not read page cache {self.page_cache_path}: {e}")
+                return None
+        if entry and time.time() - entry[0] < self.cache_ttl:
+            return entry[1]
+        return None
+    
+    def cache_page(self, url, content):
+        """Remember the body fetched from url for later runs"""
+        if not self.use_cache or not url or content is None:
+            return
+        with self._page_cache_lock:
+            try:
+                self._open_page_cache()[url] = (time.time(), content)
+            except Exception as e:
+                print(f"Could not write page cache {self.page_cache_path}: {e}")
+    
+    def close_page_cache(self):
+        """Flush and close the page cache shelf if it was opened"""
+        with self._page_cache_lock:
+            if self._page_cache is not None:
+                self._page_cache.close()
+                self._page_cache = None
     
     def create_error_result(self, book: Book, error_type: str = 'Error'):
         """Create a standardized error result for a book"""
@@ -225,77 +617,228 @@ class LibraryScraperBase(ABC):
             'branch_availability': branches
         }
     
+    def settle_search_results(self, book: Book):
+        """Search for a book, re-checking any result whose availability is still loading"""
+        print(f"Processing: {book.title} by {book.author}")
+        
+        # Search for the book, reusing results memoized on the cleaned (title, author)
+        search_results = self.get_cached_search(book)
+        if search_results is not None:
+            return search_results
+        search_results = self.search_book(book)
+        if not search_results:
+            return search_results
+        
+        settled = []
+        retry_results = None
+        for index, result in enumerate(search_results):
+            # Handle loading availability - poll the detail page, then retry the search if needed
+            if result['availability'] == 'Loading':
+                print(f"Availability still loading for {book.title}, retrying...")
+                availability = self.poll_availability(result['detail_link'])
+                if availability:
+                    result = dict(result, availability=availability)
+                else:
+                    # Retry the search with additional wait time, once for the whole book
+                    if retry_results is None:
+                        retry_results = self.search_book_with_retry(book) or []
+                    if index < len(retry_results):
+                        result = retry_results[index]  # Same query, so rows line up
+            settled.append(result)
+        # Cache the settled rows; cache_search skips them if any are still loading
+        self.cache_search(book, settled)
+        return settled
+    
+    def poll_availability(self, detail_link):
+        """Re-check one result's availability by polling its detail page
+
+        The page is probed once, then again after each poll_backoff delay while it is
+        still loading. Returns None when the availability is still unknown, so the caller
+        can fall back to a full search.
+        """
+        if not detail_link:
+            return None
+        availability = self._poll_availability(detail_link)
+        for delay in self.poll_backoff:
+            if availability != 'Loading':
+                break
+            time.sleep(delay)
+            availability = self._poll_availability(detail_link)
+        return None if availability == 'Loading' else availability
+    
+    def _poll_availability(self, detail_link):
+        """Fetch just the availability for a detail page - optional override for subclasses
+
+        Return 'Loading' to be polled again, or None if the page cannot be polled.
+        """
+        return None
+    
+    def needs_branch_lookup(self, result: dict):
+        """Whether a search result is worth a detail page visit for branch availability"""
+        return result['availability'] == 'Available' and bool(result['detail_link'])
+    
+    def lookup_branches(self, result: dict):
+        """Get the available branches for a search result, or None"""
+        branch_availability = self.get_branch_availability(result['detail_link'])
+        if branch_availability:
+            return branch_availability[1]
+        return None
+    
+    def get_branch_availability_batch(self, detail_links):
+        """Get branch availability for several detail links, one entry per link
+
+        A link whose lookup raised gets the exception in its place. The default checks
+        the links one at a time; scrapers that need a browser override this to share one
+        driver across the batch.
+        """
+        results = []
+        for detail_link in detail_links:
+            try:
+                results.append(self.get_branch_availability(detail_link))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def build_book_results(self, book: Book, search_results, branches=None):
+        """Turn a book's settled search results and branch lists into result rows"""
+        if not search_results:
+            print(f"❌ No results found for '{book.title}' by {book.author}")
+            return [self.create_not_found_result(book)]
+        if branches is None:
+            branches = [None] * len(search_results)
+        return [self.create_success_result(book, result, result['availability'], result_branches)
+                for result, result_branches in zip(search_results, branches)]
+    
     def process_single_book(self, book: Book):
         """Process a single book - shared implementation"""
         try:
-            print(f"Processing: {book.title} by {book.author}")
-            
-            # Search for the book
-            search_results = self.search_book(book)
-            
-            if search_results:
-               # print(f"✅ Found {len(search_results)} result(s) for '{book.title}'")
-                results = []
-                for result in search_results:
-                    # Handle loading availability - retry if needed
-                    if result['availability'] == 'Loading':
-                        print(f"Availability still loading for {book.title}, retrying...")
-                        # Retry the search with additional wait time
-                        retry_results = self.search_book_with_retry(book)
-                        if retry_results:
-                            result = retry_results[0]  # Use the retry result
-                    
-                    # Get detailed branch availability if needed
-                    branch_availability = None
-                    if result['availability'] == 'Available' and result['detail_link']:
-                        branch_availability = self.get_branch_availability(result['detail_link'])
-
-                    if branch_availability:
-                      #  availability = branch_availability[0]
-                        branches = branch_availability[1]
-                    else:
-                        
-                        branches = None
-
-                    availability = result['availability']
-                    result_data = self.create_success_result(book, result, availability, branches)
-                    results.append(result_data)
-                
-                return results
-            else:
-                print(f"❌ No results found for '{book.title}' by {book.author}")
-                return [self.create_not_found_result(book)]
-                
+            search_results = self.settle_search_results(book)
+            branches = [self.lookup_branches(result) if self.needs_branch_lookup(result) else None
+                        for result in search_results or ()]
+            return self.build_book_results(book, search_results, branches)
         except Exception as e:
             print(f"Error processing book '{book.title}': {e}")
             return [self.create_error_result(book)]
     
-    def check_books(self, books: List[Book], preferred_branch=None):
-        """Check availability for a list of books using multithreading - shared implementation"""
+    def check_books(self, books: List[Book], preferred_branch=None, on_results=None):
+        """Check availability for a list of books using multithreading - shared implementation
+
+        At most max_workers searches are in flight at once. As each finishes, a book with
+        nothing to look up is complete, and otherwise all of its branch lookups go to the
+        workers as one batch so browser-based scrapers can share a driver across them.
+
+        If on_results is given it is called with each book's results as soon as that book
+        completes, so callers can persist them incrementally.
+        """
         all_results = []
         
+        def emit(results):
+            all_results.extend(results)
+            if on_results:
+                on_results(results)
+        
         print(f"Processing {len(books)} books with {self.max_workers} workers...")
         
-        # Use ThreadPoolExecutor for thread-safe multithreading
+        queued = iter(books)
+        searches = {}  # search future -> book
+        lookups = {}  # branch lookup batch future -> (book, search results)
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_book = {executor.submit(self.process_single_book, book): book for book in books}
+            def submit_search():
+                book = next(queued, None)
+                if book is not None:
+                    searches[executor.submit(self.settle_search_results, book)] = book
             
-            # Process completed tasks
-            for future in as_completed(future_to_book):
-                book = future_to_book[future]
-                try:
-                    results = future.result()
+            for _ in range(self.max_workers):
+                submit_search()
+            
+            while searches or lookups:
+                done, _ = wait([*searches, *lookups], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in searches:
+                        book = searches.pop(future)
+                        submit_search()
+                        try:
+                            search_results = future.result()
+                        except Exception as e:
+                            print(f"Error processing book '{book.title}': {e}")
+                            emit([self.create_error_result(book)])
+                            continue
+                        links = [result['detail_link'] for result in search_results or ()
+                                 if self.needs_branch_lookup(result)]
+                        if links:
+                            lookups[executor.submit(self.get_branch_availability_batch, links)] = (book, search_results)
+                        else:
+                            emit(self.build_book_results(book, search_results))
+                    else:
+                        book, search_results = lookups.pop(future)
+                        emit(self.finish_book(book, search_results, future))
+        
+        return all_results
+    
+    def finish_book(self, book: Book, search_results, lookup_batch):
+        """Build a book's rows from its finished branch lookup batch future"""
+        try:
+            lookup_results = iter(lookup_batch.result())
+        except Exception as e:
+            print(f"Error processing book '{book.title}': {e}")
+            return [self.create_error_result(book)]
+        
+        branches = []
+        for result in search_results:
+            if not self.needs_branch_lookup(result):
+                branches.append(None)
+                continue
+            branch_availability = next(lookup_results)
+            if isinstance(branch_availability, Exception):
+                print(f"Error processing book '{book.title}': {branch_availability}")
+                return [self.create_error_result(book)]
+            branches.append(branch_availability[1] if branch_availability else None)
+        return self.build_book_results(book, search_results, branches)
+    
+    async def process_single_book_async(self, client, book: Book):
+        """Process a single book for check_books_async
+
+        The default runs the blocking process_single_book on a worker thread; scrapers
+        that can work over plain HTTP override this to use the shared async client.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.process_single_book, book)
+    
+    async def check_books_async(self, books: List[Book], preferred_branch=None, on_results=None):
+        """Check availability for a list of books with asyncio over one shared HTTP/2 client"""
+        all_results = []
+        concurrency = self.max_workers * self.async_concurrency_factor
+        
+        print(f"Processing {len(books)} books with up to {concurrency} concurrent requests...")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        async with httpx.AsyncClient(http2=True, limits=limits, headers=self.get_default_headers(),
+                                     follow_redirects=True) as client:
+            async def run(book):
+                async with semaphore:
+                    try:
+                        results = await self.process_single_book_async(client, book)
+                    except Exception as e:
+                        print(f"Error processing book {book.title}: {e}")
+                        results = [self.create_error_result(book)]
                     all_results.extend(results)
-                except Exception as e:
-                    print(f"Error processing book {book.title}: {e}")
-                    # Add error result
-                    all_results.append(self.create_error_result(book))
+                    if on_results:
+                        on_results(results)
+            
+            await asyncio.gather(*(run(book) for book in books))
         
         return all_results
     
     def cleanup(self):
         """Clean up resources"""
+        # open() is already torn down when __del__ runs at interpreter exit
+        if hasattr(self, '_search_cache') and not sys.is_finalizing():
+            self.save_search_cache()
+        if hasattr(self, '_page_cache') and not sys.is_finalizing():
+            self.close_page_cache()
+        if hasattr(self, 'rate_bucket'):
+            self.rate_bucket.stop()
         if hasattr(self, 'driver_pool'):
             self.driver_pool.cleanup()
     
@@ -323,16 +866,14 @@ class LibraryScraperBase(ABC):
         return None
 
 class PBCLibraryScraper(LibraryScraperBase):
-    def __init__(self, max_workers: int = 3):
-        super().__init__(max_workers)
+    # Searches and availability lookups are plain HTTP, so many can share the HTTP/2 connection
+    async_concurrency_factor = 4
+    catalog_home = "https://pbclibrary.bibliocommons.com"
+
+    def __init__(self, max_workers: int = 3, use_cache: bool = True):
+        super().__init__(max_workers, use_cache)
         self.base_url = "https://pbclibrary.bibliocommons.com/v2/search"
-        
-        # Initialize session with better settings for reliability
-        self.session.mount('https://', requests.adapters.HTTPAdapter(
-            max_retries=3,
-            pool_connections=10,
-            pool_maxsize=10
-        ))
+
         
     def build_search_query(self, title, author):
         """Build the BiblioCommons search query string"""
@@ -345,64 +886,111 @@ class PBCLibraryScraper(LibraryScraperBase):
         return query
     
     
-    def search_book(self, book: Book):
-        """Search for a book and return availability information"""
-        thread_id = threading.current_thread().ident
-        super()._rate_limit(thread_id)
-        
-        title = super().clean_title(book.title)
-        query = self.build_search_query(title, book.author)
-        
-        params = {
+    def build_search_params(self, book: Book):
+        """Build the request parameters for a BiblioCommons search"""
+        title = self.clean_title(book.title)
+        return {
             'custom_edit': 'false',
-            'query': query,
+            'query': self.build_search_query(title, book.author),
             'searchType': 'bl',
             'suppress': 'true'
         }
+    
+    def search_book(self, book: Book):
+        """Search for a book and return availability information"""
+        self.rate_bucket.acquire()
+        
+        params = self.build_search_params(book)
         
         # Add retry logic for better reliability
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.session.get(self.base_url, params=params, timeout=15)
+                response = self.session.get(self.base_url, params=params, headers=self.headers, timeout=15)
                 response.raise_for_status()
                 
-                return self.parse_search_results(response.text, book)
+                # Parse the decompressed bytes directly instead of decoding them to str first
+                return self.parse_search_results(response.content, book)
                 
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 print(f"Error searching for '{book.title}' by {book.author} (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
                     time.sleep(2)  # Wait before retry
                 else:
                     return None
     
+    async def search_book_async(self, client, book: Book):
+        """Async version of search_book using the shared httpx client"""
+        # Wait for a rate-limit token on a worker thread so the event loop keeps running
+        await asyncio.get_event_loop().run_in_executor(None, self.rate_bucket.acquire)
+        params = self.build_search_params(book)
+        
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                response = await client.get(self.base_url, params=params, timeout=15)
+                response.raise_for_status()
+                
+                # Parse the decompressed bytes directly instead of decoding them to str first
+                return self.parse_search_results(response.content, book)
+                
+            except httpx.HTTPError as e:
+                print(f"Error searching for '{book.title}' by {book.author} (attempt {attempt + 1}/{max_retries}): {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2)  # Wait before retry
+                else:
+                    return None
+    
+    async def process_single_book_async(self, client, book: Book):
+        """HTTP-only version of process_single_book used by check_books_async"""
+        print(f"Processing: {book.title} by {book.author}")
+        
+        search_results = self.get_cached_search(book)
+        if search_results is None:
+            search_results = await self.search_book_async(client, book)
+            self.cache_search(book, search_results)
+        if not search_results:
+            print(f"❌ No results found for '{book.title}' by {book.author}")
+            return [self.create_not_found_result(book)]
+        
+        results = []
+        for result in search_results:
+            branches = None
+            if result['availability'] == 'Available' and result['detail_link']:
+                branch_availability = await self.get_branch_availability_async(client, result['detail_link'])
+                if branch_availability:
+                    branches = branch_availability[1]
+            results.append(self.create_success_result(book, result, result['availability'], branches))
+        
+        return results
+    
     def parse_search_results(self, html_content, original_book: Book):
         """Parse the search results HTML to extract availability info"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = LexborHTMLParser(html_content)
         
         results = []
         
         # Look for book items in the search results
-        book_items = soup.find('div', class_='cp-search-result-item-content')
+        book_items = tree.css_first('div.cp-search-result-item-content')
         if book_items:
             try:
                 # Extract book title
-                title_elem = book_items.find('span', class_='title-content')
-                book_title = title_elem.get_text(strip=True) if title_elem else "Unknown"
+                title_elem = book_items.css_first('span.title-content')
+                book_title = title_elem.text(strip=True) if title_elem else "Unknown"
 
                 # Extract author
-                author_elem = book_items.find('span', class_='cp-author-link')
-                book_author = author_elem.get_text(strip=True) if author_elem else "Unknown"
+                author_elem = book_items.css_first('span.cp-author-link')
+                book_author = author_elem.text(strip=True) if author_elem else "Unknown"
                 if book_author != "Unknown" and ', ' in book_author:
                     # Change to First Last format
                     last_name, first_name = book_author.split(', ', 1)
                     book_author = f"{first_name} {last_name}"
                 
                 # Extract availability information
-                availability_elem = book_items.find('span', class_='cp-availability-status')
+                availability_elem = book_items.css_first('span.cp-availability-status')
                 availability = "Available"
                 if availability_elem:
-                    text = availability_elem.get_text().strip()
+                    text = availability_elem.text().strip()
                     if text == "Available":
                         availability = "Available"
                     elif text == "All copies in use":
@@ -411,19 +999,20 @@ class PBCLibraryScraper(LibraryScraperBase):
                         availability = "Unknown"
                     
                 # Extract format information
-                format_elem = book_items.find('li', class_='bib-field-value')
-                book_format = format_elem.get_text(strip=True) if format_elem else "Unknown"
+                format_elem = book_items.css_first('li.bib-field-value')
+                book_format = format_elem.text(strip=True) if format_elem else "Unknown"
                     
                 # Extract link to detailed view
-                link_elem = book_items.find('a', href=True)
-                detail_link = link_elem['href'] if link_elem else None
+                link_elem = book_items.css_first('a[href]')
+                detail_link = link_elem.attributes['href'] if link_elem else None
                 if detail_link and not detail_link.startswith('http'):
                     detail_link = f"https://pbclibrary.bibliocommons.com{detail_link}"
                         
+                # Titles, authors and formats repeat across books, so share one copy of each
                 results.append({
-                    'title': book_title,
-                    'author': book_author,
-                    'format': book_format,
+                    'title': sys.intern(book_title),
+                    'author': sys.intern(book_author),
+                    'format': sys.intern(book_format),
                     'availability': availability,
                     'detail_link': detail_link
                 })
@@ -435,36 +1024,104 @@ class PBCLibraryScraper(LibraryScraperBase):
     
     def extract_branch_names(self, tbody_text):
         # flexible approach to extract branch names
-      
-        lines = tbody_text.strip().split('\n')
-        branch_names = []
+        branch_names = {}  # dict keeps first-seen order while removing duplicates
         
-        for line in lines:
+        for line in tbody_text.strip().split('\n'):
             line = line.strip()
             if not line:
                 continue
-                
-            # Look for common branch patterns
-            # Pattern 1: Standard branch/library names (ends with BRANCH or LIBRARY)
-            branch_match = re.match(r'^([A-Z][A-Z\s\-\.]+(?:BRANCH|LIBRARY))(?:\s*-\s*[A-Za-z\s]+)?$', line)
-            if branch_match:
-                branch_names.append(branch_match.group(1).strip())
-                continue
             
-            # Pattern 2: Special services like BOOKS BY MAIL, BOOKMOBILE
-            service_match = re.match(r'^([A-Z][A-Z\s\-\.]+(?:BOOKS BY MAIL|BOOKMOBILE|MAIL|MOBILE))(?:\s*-\s*[A-Za-z\s]+)?$', line)
-            if service_match:
-                branch_names.append(service_match.group(1).strip())
-                continue
-            
-            # Pattern 3: Any line that starts with capital letters and contains library-related keywords
-            if re.match(r'^[A-Z][A-Z\s\-\.]+$', line) and any(keyword in line.upper() for keyword in ['BRANCH', 'LIBRARY', 'BOOKS', 'MAIL', 'MOBILE']):
-                branch_names.append(line)
-                continue
+            match = _BRANCH_RE.match(line)
+            if match:
+                branch_names[sys.intern(match.group(match.lastgroup).strip())] = None
         
-        return list(set(branch_names))  # Remove duplicates
+        return list(branch_names)
     
+    def availability_url(self, detail_link):
+        """Return the availability endpoint for a detail link, or None if it has no record id"""
+        match = _BIB_ID_RE.search(detail_link)
+        return _PBC_AVAILABILITY_URL.format(match.group(1)) if match else None
+
+    def parse_availability_json(self, data):
+        """Turn the availability endpoint's JSON into [availability, branch_info]
+
+        Raises ValueError if the response does not have the expected shape, so callers
+        fall back to Selenium rather than reporting every copy as unavailable.
+        """
+        entities = data.get('entities') if isinstance(data, dict) else None
+        items = entities.get('bibItems') if isinstance(entities, dict) else None
+        if not isinstance(items, dict):
+            raise ValueError("availability response has no entities.bibItems")
+
+        # Build the same "BRANCH NAME" lines the availability table renders
+        lines = []
+        for item in items.values():
+            item_availability = item.get('availability') or {}
+            status = item_availability.get('statusType') or item_availability.get('status') or ''
+            branch_name = (item.get('branch') or {}).get('name')
+            if branch_name and status.upper() == 'AVAILABLE':
+                lines.append(branch_name.upper())
+
+        branch_names = self.extract_branch_names('\n'.join(lines))
+        availability = "Available" if branch_names else "Unavailable"
+        return [availability, [{'branch': branch} for branch in branch_names]]
+
+    def fetch_branch_availability(self, detail_link):
+        """Fetch branch availability from the BiblioCommons availability endpoint, no browser needed"""
+        url = self.availability_url(detail_link)
+        if not url:
+            return None
+
+        content = self.get_cached_page(url)
+        if content is not None:
+            return self.parse_availability_json(orjson.loads(content))
+
+        response = self.session.get(
+            url,
+            headers={**self.headers, 'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'},
+            timeout=15
+        )
+        response.raise_for_status()
+        results = self.parse_availability_json(orjson.loads(response.content))
+        self.cache_page(url, response.content)
+        return results
+
+    async def get_branch_availability_async(self, client, detail_link):
+        """Async availability check over the shared client, with Selenium on a thread as fallback"""
+        url = self.availability_url(detail_link)
+        if url:
+            try:
+                content = self.get_cached_page(url)
+                if content is not None:
+                    return self.parse_availability_json(orjson.loads(content))
+                
+                response = await client.get(
+                    url,
+                    headers={'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'},
+                    timeout=15
+                )
+                response.raise_for_status()
+                results = self.parse_availability_json(orjson.loads(response.content))
+                self.cache_page(url, response.content)
+                return results
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"Availability request failed for {detail_link}, falling back to Selenium: {e}")
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.selenium_branch_availability, detail_link)
+
     def get_branch_availability(self, detail_link):
+        """Availability check, using the JSON endpoint first and Selenium as a fallback"""
+        try:
+            results = self.fetch_branch_availability(detail_link)
+            if results is not None:
+                return results
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Availability request failed for {detail_link}, falling back to Selenium: {e}")
+
+        return self.selenium_branch_availability(detail_link)
+
+    def selenium_branch_availability(self, detail_link):
         """Selenium-based availability check with thread-safe driver pool"""
         driver = self.driver_pool.get_driver()
         if not driver:
@@ -521,9 +1178,17 @@ class PBCLibraryScraper(LibraryScraperBase):
 
 # --- New AlachuaCountyLibraryScraper ---
 class AlachuaCountyLibraryScraper(LibraryScraperBase):
-    def __init__(self, max_workers: int = 3):
-        super().__init__(max_workers)
+    catalog_home = "https://catalog.aclib.us"
+    # Detail pages are server-rendered and the holdings load client-side, so re-fetching
+    # a page that is still loading returns the same placeholder
+    poll_backoff = ()
+
+    def __init__(self, max_workers: int = 3, use_cache: bool = True):
+        super().__init__(max_workers, use_cache)
         self.base_url = "https://catalog.aclib.us/search/searchresults.aspx"
+        # Cleared once a plain HTTP search page comes back without its availability filled in,
+        # since every later page will too and the extra request only slows each search down
+        self.http_search = True
         
     def build_search_query(self, title, author):
         # Return a dict of advanced search parameters for title and author
@@ -543,7 +1208,9 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
             'page': '0'
         }
     
-    def clean_title_text(self, title):
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def clean_title_text(title):
         """Clean and format title text by adding proper spacing"""
         if not title:
             return title
@@ -551,58 +1218,68 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
         # Remove extra whitespace
         title = ' '.join(title.split())
         
-        # Common patterns to fix
-        replacements = [
-            # Fix common word boundaries
-            (r'([a-z])([A-Z])', r'\1 \2'),  # Add space between camelCase
-            (r'([a-z])(\d)', r'\1 \2'),     # Add space between letter and number
-            (r'(\d)([A-Za-z])', r'\1 \2'),  # Add space between number and letter
-            
-            # Fix specific common patterns
-            (r'Beforethe', 'Before the'),
-            (r'Beforewe', 'Before we'),
-            (r'Beforecoffee', 'Before coffee'),
-            (r'Beforeforget', 'Before forget'),
-            (r'Beforegoodbye', 'Before goodbye'),
-            (r'Beforekindness', 'Before kindness'),
-            (r'Beforethecoffeegetscold', 'Before the coffee gets cold'),
-            (r'Beforewesaygoodbye', 'Before we say goodbye'),
-            (r'Beforeweforgetkindness', 'Before we forget kindness'),
-            
-            # Fix other common patterns
-            (r'([a-z])([A-Z][a-z])', r'\1 \2'),  # More camelCase fixes
-            (r'([a-z])([A-Z]{2,})', r'\1 \2'),   # Fix ALL CAPS words
-            
-            # Clean up multiple spaces
-            (r'\s+', ' '),
-        ]
-        
-        for pattern, replacement in replacements:
-            title = re.sub(pattern, replacement, title)
+        for pattern, replacement in _CLEAN_PATTERNS:
+            title = pattern.sub(replacement, title)
         
+        return AlachuaCountyLibraryScraper.title_case(title)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def title_case(title):
+        """Title-case already spaced text, keeping short joining words lowercase"""
         # Capitalize first letter of each word (title case)
         title = title.title()
         
         # Fix common words that should be lowercase
-        lowercase_words = ['a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'up', 'with']
         words = title.split()
         for i, word in enumerate(words):
-            if word.lower() in lowercase_words and i > 0:  # Don't lowercase the first word
+            if i > 0 and word.lower() in _LOWERCASE_WORDS:  # Don't lowercase the first word
                 words[i] = word.lower()
         
         return ' '.join(words)
 
-    def search_book(self, book: Book):
-        from urllib.parse import urlencode
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        thread_id = threading.current_thread().ident
-        super()._rate_limit(thread_id)
-        title = super().clean_title(book.title)
+    def build_search_url(self, book: Book):
+        """Build the full advanced-search URL for a book"""
+        title = self.clean_title(book.title)
         author = book.author.strip().replace('"', '')
-        params = self.build_search_query(title, author)
-        url = f"{self.base_url}?{urlencode(params)}"
+        return f"{self.base_url}?{urlencode(self.build_search_query(title, author))}"
+
+    def search_book(self, book: Book):
+        """Search the catalog over plain HTTP, using Selenium when that is refused, fails or
+        comes back with availability that only the browser can fill in"""
+        self.rate_bucket.acquire()
+        url = self.build_search_url(book)
+        if not self.http_search:
+            return self.selenium_search_book(book, url)
+        try:
+            response = self.session.get(url, headers=self.headers, timeout=15)
+            if response.status_code not in (403, 503):
+                response.raise_for_status()
+                search_results = self.parse_search_results(response.content, book)
+                # Availability arrives by AJAX, so a row still loading, or with no availability at all
+                # because the script adds it, needs one browser load for the whole page
+                if not any(result['availability'] in ('Loading', 'Unknown') for result in search_results):
+                    return search_results
+                self.http_search = False
+                return self.selenium_search_book(book, url)
+            print(f"ACLD search returned HTTP {response.status_code}, using Selenium instead")
+        except httpx.HTTPError as e:
+            print(f"ACLD HTTP search failed for '{book.title}', using Selenium instead: {e}")
+        return self.selenium_search_book(book, url)
+
+    def wait_for_availability(self, driver, timeout):
+        """Block until the availability loaders are gone, signalled by a MutationObserver"""
+        try:
+            driver.execute_script(_AJAX_DONE_JS)
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return window.__ajaxDone === true")
+            )
+        except Exception:
+            # If the loaders never clear, parse whatever has arrived
+            pass
+
+    def selenium_search_book(self, book: Book, url):
+        """Load the search page in a pooled browser so the AJAX availability can finish"""
         driver = self.driver_pool.get_driver()
         if not driver:
             print("Could not get Selenium driver for ACLD search.")
@@ -615,40 +1292,21 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
                     EC.presence_of_element_located((By.CSS_SELECTOR, ".content-module--search-result"))
                 )
                 
-                # Wait for AJAX availability data to load
-                # Look for loading images and wait for them to disappear
-                wait = WebDriverWait(driver, 15)
-                try:
-                    # Wait for any loading images to disappear
-                    wait.until_not(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "img[src*='ajax-loader']"))
-                    )
-                except:
-                    # If no loading images found or timeout, continue anyway
-                    pass
-                
-                # Additional wait to ensure availability data is loaded
-                time.sleep(2)
+                # Wait for the AJAX availability data to replace the loaders
+                self.wait_for_availability(driver, 10)
                 
             except Exception as e:
                 print(f"Timeout or error waiting for ACLD search results: {e}")
             html_content = driver.page_source
-            return self.parse_search_results(html_content, book)
         finally:
             self.driver_pool.return_driver(driver)
+        # Parse with the driver already back in the pool
+        return self.parse_search_results(html_content, book)
     
     def search_book_with_retry(self, book: Book):
         """Retry search with additional wait time for AJAX content"""
-        from urllib.parse import urlencode
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        thread_id = threading.current_thread().ident
-        super()._rate_limit(thread_id)
-        title = super().clean_title(book.title)
-        author = book.author.strip().replace('"', '')
-        params = self.build_search_query(title, author)
-        url = f"{self.base_url}?{urlencode(params)}"
+        self.rate_bucket.acquire()
+        url = self.build_search_url(book)
         driver = self.driver_pool.get_driver()
         if not driver:
             print("Could not get Selenium driver for ACLD retry search.")
@@ -661,101 +1319,94 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
                     EC.presence_of_element_located((By.CSS_SELECTOR, ".content-module--search-result"))
                 )
                 
-                # Extended wait for AJAX availability data to load
-                wait = WebDriverWait(driver, 20)
-                try:
-                    # Wait for any loading images to disappear with longer timeout
-                    wait.until_not(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "img[src*='ajax-loader']"))
-                    )
-                except:
-                    # If still loading after extended wait, continue anyway
-                    pass
-                
-                # Additional wait to ensure availability data is loaded
-                time.sleep(5)
+                # Extended wait for the AJAX availability data
+                self.wait_for_availability(driver, 20)
                 
             except Exception as e:
                 print(f"Timeout or error waiting for ACLD retry search results: {e}")
             html_content = driver.page_source
-            return self.parse_search_results(html_content, book)
         finally:
             self.driver_pool.return_driver(driver)
+        # Parse with the driver already back in the pool
+        return self.parse_search_results(html_content, book)
 
     def parse_search_results(self, html_content, original_book: Book):
-        soup = BeautifulSoup(html_content, 'html.parser')
-        results = []
+        tree = LexborHTMLParser(html_content)
         # Polaris catalog: look for result rows
         # Rows is a list of all of the possible results
-        rows = soup.find_all('div', class_='content-module content-module--search-result')
+        rows = tree.css('div.content-module.content-module--search-result')
         
         #Look at only first 3 results
-        num_to_search = rows[:3] if len(rows) >= 3 else rows
-        for row in num_to_search:
+        num_to_search = rows[:3]
+        # One slot per row; rows that fail to parse leave theirs empty
+        results = [None] * len(num_to_search)
+        classify_availability = _AVAIL_CLASSIFY_RE.match  # bound once, used for every row
+        for index, row in enumerate(num_to_search):
+            row_css_first = row.css_first
             try:    
                 # Find all the title parts - try multiple selectors
 
                 
                 book_title = "Unknown"
-                title_div = row.find('div', class_="nsm-brief-primary-title-group")
+                title_div = row_css_first('div.nsm-brief-primary-title-group')
                 if title_div:
-                    test =  title_div.find('span', class_="nsm-short-item nsm-e135")
+                    test =  title_div.css_first('span.nsm-short-item.nsm-e135')
                     if test:
                         # Extract text from all nsm-hit-text spans within the nsm-short-item
-                        hit_text_spans = test.find_all('span', class_="nsm-hit-text")
+                        hit_text_spans = test.css('span.nsm-hit-text')
                         if hit_text_spans:
-                            raw_title = " ".join([span.get_text(strip=True) for span in hit_text_spans])
+                            raw_title = " ".join([span.text(strip=True) for span in hit_text_spans])
                         else:
                             # Fallback to direct text if no hit-text spans found
-                            raw_title = test.get_text(strip=True)
+                            raw_title = test.text(strip=True)
                         
                         # Clean up the title by adding proper spacing
                         cleaned_title = self.clean_title_text(raw_title)
-                        print(f"Test title: {raw_title} -> {cleaned_title}")
+                        logger.debug("Test title: %s -> %s", raw_title, cleaned_title)
                         book_title = cleaned_title
                     else:
-                        title_spans = title_div.find_all('span', class_="nsm-hit-text")
+                        title_spans = title_div.css('span.nsm-hit-text')
                         if title_spans:
-                            raw_title = " ".join([span.get_text(strip=True) for span in title_spans])
+                            raw_title = " ".join([span.text(strip=True) for span in title_spans])
                             book_title = self.clean_title_text(raw_title)
                         else:
                             # Try alternative title selectors
-                            title_link = title_div.find('a')
+                            title_link = title_div.css_first('a')
                             if title_link:
-                                raw_title = title_link.get_text(strip=True)
+                                raw_title = title_link.text(strip=True)
                                 book_title = self.clean_title_text(raw_title)
                 
                
                 # If still unknown, try the nsm-short-item nsm-e135 selector which seems to work
                 if book_title == "Unknown":
                     # Try the specific selector that seems to work
-                    test_elem = row.find('span', class_="nsm-short-item nsm-e135")
+                    test_elem = row_css_first('span.nsm-short-item.nsm-e135')
                     if test_elem:
                         # Extract text from all nsm-hit-text spans within the nsm-short-item
-                        hit_text_spans = test_elem.find_all('span', class_="nsm-hit-text")
+                        hit_text_spans = test_elem.css('span.nsm-hit-text')
                         if hit_text_spans:
-                            raw_title = " ".join([span.get_text(strip=True) for span in hit_text_spans])
+                            raw_title = " ".join([span.text(strip=True) for span in hit_text_spans])
                         else:
                             # Fallback to direct text if no hit-text spans found
-                            raw_title = test_elem.get_text(strip=True)
+                            raw_title = test_elem.text(strip=True)
                         
                         book_title = self.clean_title_text(raw_title)
-                        print(f"Found title using nsm-short-item: {raw_title} -> {book_title}")
+                        logger.debug("Found title using nsm-short-item: %s -> %s", raw_title, book_title)
                     else:
                         book_title = original_book.title
-                        print(f"Using original title for {original_book.title}: {book_title}")
+                        logger.debug("Using original title for %s: %s", original_book.title, book_title)
                 # Find the parent <a> tag for the detail link (adjust selector as needed)
-                link_elem = row.find('a', class_="nsm-brief-action-link", href=True)
-                detail_link = link_elem['href'] if link_elem else None
+                link_elem = row_css_first('a.nsm-brief-action-link[href]')
+                detail_link = link_elem.attributes['href'] if link_elem else None
                 if detail_link and not detail_link.startswith('http'):
-                    print(detail_link)
+                    logger.debug("Relative detail link: %s", detail_link)
                     detail_link = f"https://catalog.aclib.us{detail_link}"
                     
                 # Author is not always present in the same div, so fallback to original
-                book_author_div = row.find('div', class_="nsm-brief-secondary-title-group")
+                book_author_div = row_css_first('div.nsm-brief-secondary-title-group')
                 if book_author_div:
-                    book_author_spans = book_author_div.find_all('span', class_="nsm-hit-text")
-                    book_author = " ".join([span.get_text(strip=True) for span in book_author_spans]) if book_author_spans else original_book.author
+                    book_author_spans = book_author_div.css('span.nsm-hit-text')
+                    book_author = " ".join([span.text(strip=True) for span in book_author_spans]) if book_author_spans else original_book.author
                 else:
                     book_author = original_book.author
             
@@ -764,54 +1415,54 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
              # Extract availability information
                 availability = "Unknown"
                 
-                availability_text = row.find_all('div', class_="nsm-brief-standard-group")
+                availability_text = row.css('div.nsm-brief-standard-group')
              #   print(f"len: {len(availability_text)}")
              
 
                 for i in availability_text:
-                    label_elem = i.find('span', class_='nsm-brief-label')
+                    group_css_first = i.css_first
+                    label_elem = group_css_first('span.nsm-brief-label')
                     if not label_elem:
                         continue
                         
-                    num_available = label_elem.get_text().strip()
+                    label = label_elem.text().strip()
                    
-                    if num_available:
+                    if label:
            
                         #print(test)
-                        if "Availability" in num_available or "Available" in num_available:
-                            availability_elem = i.find('span', class_='nsm-short-item')
+                        if "Availability" in label or "Available" in label:
+                            availability_elem = group_css_first('span.nsm-short-item')
                             
                             if not availability_elem:
                                 # Check if there's still a loading image
-                                loading_img = i.find('img', src=lambda x: x and 'ajax-loader' in x)
+                                loading_img = group_css_first("img[src*='ajax-loader']")
                                 if loading_img:
-                                    print(f"Availability still loading for {book_title}: {i}")
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug("Availability still loading for %s: %s", book_title, i.html)
                                     availability = "Loading"  # Mark as loading instead of Unknown
                                 else:
-                                    print(f"Availability element not found for {book_title}: {i}")
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug("Availability element not found for %s: %s", book_title, i.html)
                                 break
 
-                            # print(f"num available test: {num_available}")
+                            # print(f"label test: {label}")
                             # print(f"available test: {availability_elem}")
                             if availability_elem:
-                                availability_text = availability_elem.get_text().strip()
+                                availability_text = availability_elem.text().strip()
                                 # Handle different availability formats
-                                if availability_text.isdigit():
-                                    amount_available = availability_text[0]
-                                    availability = "Unavailable" if amount_available == "0" else "Available"
-                                elif "available" in availability_text.lower():
+                                match = classify_availability(availability_text)
+                                kind = match.lastgroup if match else None
+                                if kind == 'count':
+                                    availability = "Unavailable" if availability_text[0] == "0" else "Available"
+                                elif kind == 'avail':
                                     availability = "Available"
-                                elif "unavailable" in availability_text.lower() or "checked out" in availability_text.lower():
+                                elif kind == 'unavail':
                                     availability = "Unavailable"
+                                elif kind == 'number':
+                                    # Number from text like "2 of 5 available"
+                                    availability = "Available" if int(match.group('number')) > 0 else "Unavailable"
                                 else:
-                                    # Try to extract number from text like "2 of 5 available"
-                                  
-                                    match = re.search(r'(\d+)', availability_text)
-                                    if match:
-                                        amount = int(match.group(1))
-                                        availability = "Available" if amount > 0 else "Unavailable"
-                                    else:
-                                        availability = "Unknown"
+                                    availability = "Unknown"
                                 
                             break
                      
@@ -824,17 +1475,21 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
                 #     print(i.get_text().strip())
 
                
-                results.append({
-                    'title': book_title,
-                    'author': book_author,
-                    'format': book_format,
+                # Titles, authors and formats repeat across books, so share one copy of each
+                results[index] = {
+                    'title': sys.intern(book_title),
+                    'author': sys.intern(book_author),
+                    'format': sys.intern(book_format),
                     'availability': availability,
                     'detail_link': detail_link,
                     'branch_availability': []
-                })
+                }
             except Exception as e:
                 print(f"Error parsing ACLD result: {e}")
         
+        if None in results:
+            results = [result for result in results if result is not None]
+        
         # If no results found, return a not found result
         if not results:
             results.append({
@@ -848,112 +1503,335 @@ class AlachuaCountyLibraryScraper(LibraryScraperBase):
         
         return results
 
+    def _poll_availability(self, detail_link):
+        """Read the holdings counts off the detail page over plain HTTP"""
+        self.rate_bucket.acquire()
+        try:
+            response = self.session.get(detail_link, headers=self.headers, timeout=10)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Availability poll failed for {detail_link}: {e}")
+            return None
+        
+        tree = LexborHTMLParser(response.content)
+        locations = tree.css('tr.location')
+        if not locations:
+            return 'Loading' if tree.css_first("img[src*='ajax-loader']") else None
+        # The holdings are complete, so the branch lookup can reuse this page instead of refetching it
+        self.cache_page(detail_link, response.content)
+        for location in locations:
+            match = _AVAIL_PAREN_RE.search(location.text())
+            if match and int(match.group(1)) > 0:
+                return 'Available'
+        return 'Unavailable'
+
     def get_branch_availability(self, detail_link):
         """Get branch availability for Alachua County Library using the detail link"""
+        html_content = self.get_cached_page(detail_link)
+        if html_content is not None:
+            return self.parse_detail_page(detail_link, html_content, fetched=False)
+        
+        html_content, tree = self.fetch_detail_page_http(detail_link)
+        if html_content is None:
+            html_content = self.fetch_detail_page(detail_link)
+        # Parse after the driver is back in the pool so other workers can use it meanwhile
+        return self.parse_detail_page(detail_link, html_content, tree)
+
+    async def get_branch_availability_async(self, client, detail_link):
+        """Async branch availability check, with Selenium on a thread for pages that need the browser"""
+        html_content = self.get_cached_page(detail_link)
+        if html_content is not None:
+            return self.parse_detail_page(detail_link, html_content, fetched=False)
+        
+        html_content, tree = await self.fetch_detail_page_async(client, detail_link)
+        if html_content is None:
+            loop = asyncio.get_event_loop()
+            html_content = await loop.run_in_executor(None, self.fetch_detail_page, detail_link)
+        return self.parse_detail_page(detail_link, html_content, tree)
+
+    async def process_single_book_async(self, client, book: Book):
+        """Search on a worker thread, then fetch all of the book's detail pages concurrently"""
+        loop = asyncio.get_event_loop()
+        # The search can fall back to Selenium, so it keeps to a thread
+        search_results = await loop.run_in_executor(None, self.settle_search_results, book)
+        
+        async def lookup(result):
+            if not self.needs_branch_lookup(result):
+                return None
+            branch_availability = await self.get_branch_availability_async(client, result['detail_link'])
+            return branch_availability[1] if branch_availability else None
+        
+        branches = await asyncio.gather(*(lookup(result) for result in search_results or ()))
+        return self.build_book_results(book, search_results, branches)
+
+    def fetch_detail_page_http(self, detail_link):
+        """Fetch a detail page over plain HTTP as (html, parsed tree)
+
+        Both are None if the request fails or the holdings need the browser to render.
+        """
+        self.rate_bucket.acquire()
+        try:
+            response = self.session.get(detail_link, headers=self.headers, timeout=15)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"ACLD detail page request failed for {detail_link}, using Selenium instead: {e}")
+            return None, None
+        
+        return self.holdings_tree(response.content)
+
+    async def fetch_detail_page_async(self, client, detail_link):
+        """Async version of fetch_detail_page_http over check_books_async's client"""
+        await asyncio.get_event_loop().run_in_executor(None, self.rate_bucket.acquire)
+        try:
+            response = await client.get(detail_link, timeout=15)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"ACLD detail page request failed for {detail_link}, using Selenium instead: {e}")
+            return None, None
+        # Parsing one detail page is quick, so it runs on the event loop rather than a thread
+        return self.holdings_tree(response.content)
+
+    @staticmethod
+    def holdings_tree(html_content):
+        """Parse a fetched detail page as (html, tree), or (None, None) if it has no holdings yet"""
+        try:
+            tree = lxml.html.fromstring(html_content, parser=_ACLD_HTML_PARSER)
+        except etree.ParserError:
+            return None, None
+        if _ACLD_LOCATION_XPATH(tree):
+            return html_content, tree
+        return None, None
+
+    def parse_detail_page(self, detail_link, html_content, tree=None, fetched=True):
+        """Parse a detail page, caching freshly fetched pages whose holdings table loaded"""
+        if html_content is None:
+            return None
+        try:
+            if tree is None:
+                tree = lxml.html.fromstring(html_content, parser=_ACLD_HTML_PARSER)
+            results = self.parse_branch_availability(html_content, tree)
+        except Exception as e:
+            print(f"Availability check failed for {detail_link}: {e}")
+            return None
+        # Pages whose holdings never rendered parse as a guess, which must not be served again later
+        if fetched and _ACLD_LOCATION_XPATH(tree):
+            self.cache_page(detail_link, html_content)
+        return results
+
+    def fetch_detail_page(self, detail_link):
+        """Load a detail page in a pooled browser and return its HTML once the holdings load"""
         driver = self.driver_pool.get_driver()
         if not driver:
             return None
             
         try:
             driver.get(detail_link)
+            self.wait_for_holdings(driver)
             
-            wait = WebDriverWait(driver, 10)
+            # Get the HTML content as bytes, which lxml parses faster than str
+            return driver.page_source.encode('utf-8')
             
-            # Wait for the page content to load
-            wait.until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+        except Exception as e:
+            print(f"Availability check failed for {detail_link}: {e}")
+            return None
+        finally:
+            # Always return driver to pool
+            self.driver_pool.return_driver(driver)
+
+    def wait_for_holdings(self, driver):
+        """Wait until the AJAX holdings rows of a detail page are present"""
+        try:
+            WebDriverWait(driver, 8).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "tr.location"))
             )
-            
-            # Wait for availability information to load
+        except Exception:
+            # Titles without holdings never render a location row; just make sure the record loaded
             try:
-                wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".location, .branch, .library-location"))
+                WebDriverWait(driver, 2).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".nsm-short-item"))
                 )
-            except:
-                # If no specific location elements found, continue anyway
+            except Exception:
                 pass
-            
-            # Additional wait for AJAX content
-            time.sleep(2)
-            
-            # Get the HTML content
-            html_content = driver.page_source
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            branch_names = []
-                 
-            location_elems = soup.select('tr.location')
-            if location_elems:
-                for elem in location_elems:
-                    branch_name = elem.get_text().strip()
-                    if branch_name and len(branch_name) > 2:  # Filter out very short text
-                        # Extract availability information from branch name
-                        # Format: "Branch Name (X of Y available)"
-                        match = re.search(r'\((\d+) of \d+ available\)', branch_name)
-                        if match:
-                    
-                            available_count = int(match.group(1))
-                            # Only add branches that have available books
-                            if available_count > 0:
-                                # Clean the branch name by removing the availability part
-                                clean_branch_name = re.sub(r'\s*\(\d+ of \d+ available\)', '', branch_name).strip()
-                                if clean_branch_name and clean_branch_name not in branch_names:
-                                    branch_names.append(clean_branch_name)
-                        else:
-                            # If no availability pattern found, check if it contains library keywords
-                            if any(keyword in branch_name.lower() for keyword in ['library', 'branch', 'center']):
-                                if branch_name not in branch_names:
-                                    branch_names.append(branch_name)
-              
-            
-            # If no branches found with specific selectors, try a broader search
-            if not branch_names:
-                # Look for any text that might be a branch name
-                all_text = soup.get_text()
-                # Common Alachua County library branch names
-                alachua_branches = [
-                    'Headquarters Library',
-                    'Millhopper Branch Library',
-                    'Tower Road Branch Library',
-                    'High Springs Branch Library',
-                    'Newberry Branch Library',
-                    'Hawthorne Branch Library',
-                    'Cone Park Branch Library',
-                    'Alachua Branch Library'
-                ]
-                
-                for branch in alachua_branches:
-                    if branch.lower() in all_text.lower():
-                        branch_names.append(branch)
-            
-            results = []
-            branch_info = []
-            for branch in branch_names:
-                branch_info.append({'branch': branch})
 
-            if branch_info:
-                results.append("Available")  # first index is availability
-                print(f"Found {len(branch_info)} branches for availability check")
-            else:
-                results.append("Unavailable")
-                print("No branches found for availability check")
-            results.append(branch_info)  # second index is available branches
-            return results
-            
+    def get_branch_availability_batch(self, detail_links):
+        """Check several detail pages, loading the uncached ones in tabs of one driver"""
+        cached = [self.get_cached_page(detail_link) for detail_link in detail_links]
+        missing = [detail_link for detail_link, html_content in zip(detail_links, cached) if html_content is None]
+        
+        # check_books already runs one batch per worker, so plain HTTP fetches go one at a time here
+        fetched = {detail_link: self.fetch_detail_page_http(detail_link) for detail_link in missing}
+        need_browser = [detail_link for detail_link in missing if fetched[detail_link][0] is None]
+        if need_browser:
+            fetched.update((detail_link, (html_content, None)) for detail_link, html_content
+                           in zip(need_browser, self.fetch_detail_pages(need_browser)))
+        
+        # Parse with the driver already back in the pool
+        return [self.parse_detail_page(detail_link, html_content, fetched=False) if html_content is not None
+                else self.parse_detail_page(detail_link, *fetched[detail_link])
+                for detail_link, html_content in zip(detail_links, cached)]
+
+    def fetch_detail_pages(self, detail_links):
+        """Load several detail pages in tabs of one driver so they load side by side"""
+        driver = self.driver_pool.get_driver()
+        if not driver:
+            return [None] * len(detail_links)
+        
+        pages = []
+        usable = False
+        try:
+            home = driver.current_window_handle
+            for start in range(0, len(detail_links), _MAX_TABS):
+                # Open every tab first so the pages load concurrently
+                tabs = []
+                for detail_link in detail_links[start:start + _MAX_TABS]:
+                    before = set(driver.window_handles)
+                    driver.execute_script("window.open(arguments[0], '_blank');", detail_link)
+                    tabs.append((detail_link, (set(driver.window_handles) - before).pop()))
+                
+                for detail_link, handle in tabs:
+                    try:
+                        driver.switch_to.window(handle)
+                    except Exception as e:
+                        # Still on the previous window, which must not be closed
+                        print(f"Availability check failed for {detail_link}: {e}")
+                        pages.append(None)
+                        continue
+                    try:
+                        self.wait_for_holdings(driver)
+                        pages.append(driver.page_source.encode('utf-8'))
+                    except Exception as e:
+                        print(f"Availability check failed for {detail_link}: {e}")
+                        pages.append(None)
+                    finally:
+                        driver.close()
+                driver.switch_to.window(home)
+                # Close any tab a failed switch left behind so they don't pile up in pooled drivers
+                for handle in set(driver.window_handles) - {home}:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(home)
+            usable = True
         except Exception as e:
-            print(f"Availability check failed for {detail_link}: {e}")
-            return None
+            print(f"Batch availability check failed: {e}")
         finally:
-            # Always return driver to pool
-            self.driver_pool.return_driver(driver)
+            # A driver left without its home window would fail every later caller
+            if usable:
+                self.driver_pool.return_driver(driver)
+            else:
+                self.driver_pool.discard_driver(driver)
+        
+        return pages + [None] * (len(detail_links) - len(pages))
+
+    def parse_branch_availability(self, html_content, tree=None):
+        """Pull the branches with copies on the shelf out of a detail page
+
+        Pass the page's lxml tree as well if the caller already built it.
+        """
+        if tree is None:
+            tree = lxml.html.fromstring(html_content, parser=_ACLD_HTML_PARSER)
+        
+        branch_names = {}  # dict keeps first-seen order while removing duplicates
+             
+        location_elems = _ACLD_LOCATION_XPATH(tree)
+        if location_elems:
+            for elem in location_elems:
+                branch_name = elem.text_content().strip()
+                if branch_name and len(branch_name) > 2:  # Filter out very short text
+                    # Extract availability information from branch name
+                    # Format: "Branch Name (X of Y available)"
+                    match = _AVAIL_PAREN_RE.search(branch_name)
+                    if match:
+                
+                        available_count = int(match.group(1))
+                        # Only add branches that have available books
+                        if available_count > 0:
+                            # Clean the branch name by removing the availability part
+                            clean_branch_name = _AVAIL_PAREN_SUB_RE.sub('', branch_name).strip()
+                            if clean_branch_name:
+                                branch_names[sys.intern(clean_branch_name)] = None
+                    else:
+                        # If no availability pattern found, check if it contains library keywords
+                        branch_lower = branch_name.lower()
+                        if any(keyword in branch_lower for keyword in _BRANCH_KEYWORDS):
+                            branch_names[sys.intern(branch_name)] = None
+          
+        
+        # If no branches found with specific selectors, try a broader search
+        if not branch_names:
+            # Look for any text that might be a branch name, in one pass over the page
+            found = {match.group(0).lower() for match in _ALACHUA_BRANCH_RE.finditer(tree.text_content())}
+            for branch in _ALACHUA_BRANCHES:
+                if branch.lower() in found:
+                    branch_names[branch] = None
+        
+        results = []
+        branch_info = [{'branch': branch} for branch in branch_names]
+
+        if branch_info:
+            results.append("Available")  # first index is availability
+            logger.debug("Found %d branches for availability check", len(branch_info))
+        else:
+            results.append("Unavailable")
+            logger.debug("No branches found for availability check")
+        results.append(branch_info)  # second index is available branches
+        return results
        
 
     
 
+# Report templates for the console summary, one format call per result
+_FOUND_TMPL = "\n--- {} by {} ---\nFound: {} by {}\nFormat: {}\nAvailability: {}\n"
+_NOTFOUND_TMPL = "\n--- {} by {} ---\n❌ Not found in library system\n"
+_LINK_TMPL = "Link: {}\n"
+_BRANCHES_TMPL = "Branch availability:\n{}\n"
+
+# Largest single os.write issued by save_results
+_WRITE_CHUNK = 2 * 1024 * 1024
+
+
+def save_results(results, path, pretty=False):
+    """Write all results to a single JSON file (compact unless pretty is set)"""
+    data = memoryview(orjson.dumps(results, option=orjson.OPT_INDENT_2 if pretty else None))
+    # Write the encoded bytes straight to the fd; os.write may be partial, so loop until done
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data[:_WRITE_CHUNK])
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
 # Example usage
 if __name__ == "__main__":
     start_time = time.time()
 
+    parser = argparse.ArgumentParser(description="Check Goodreads books against a library catalog")
+    parser.add_argument('--legacy-json', action='store_true',
+                        help="also write all results as a single JSON array when the run finishes")
+    parser.add_argument('--pretty', action='store_true',
+                        help="indent the --legacy-json output for reading by hand")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="check books with asyncio over a shared HTTP/2 connection")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="ignore and do not update the saved search results")
+    parser.add_argument('--verbose', action='store_true',
+                        help="log how each search result and detail page was parsed")
+    args = parser.parse_args()
+
+    # Parse diagnostics are debug-level and stay hidden unless --verbose is given
+    logging.basicConfig(format="%(message)s", level=logging.WARNING)
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    # Report output is buffered in a MemoryHandler and reaches stdout only when flushed
+    report_handler = logging.StreamHandler(sys.stdout)
+    report_handler.setFormatter(logging.Formatter("%(message)s"))
+    report_buffer = logging.handlers.MemoryHandler(1024, flushLevel=logging.CRITICAL, target=report_handler)
+    report_log = logging.getLogger("results")
+    report_log.addHandler(report_buffer)
+    report_log.setLevel(logging.INFO)
+    report_log.propagate = False
       
     print("Default file or enter a CSV?")
     print("1. Default")
@@ -988,53 +1866,73 @@ if __name__ == "__main__":
     choice = input("Enter 1 or 2: ").strip()
     max_workers = input("Enter number of workers: ").strip()
     if choice == "2":
-        scraper = AlachuaCountyLibraryScraper(int(max_workers))
+        scraper = AlachuaCountyLibraryScraper(int(max_workers), use_cache=args.use_cache)
     else:
-        scraper = PBCLibraryScraper(int(max_workers))
+        scraper = PBCLibraryScraper(int(max_workers), use_cache=args.use_cache)
   
+    file = "PBSC" if choice == "1" else "Alachua"
+    ndjson_path = f'data/{file}_availability.jsonl'
+    json_path = f'data/{file}_availability.json'
 
-
+    # Collected outside the try so an interrupted run can still save what finished
+    results = []
+    saved = False
     try:
-        # Check availability
-        results = scraper.check_books(books, preferred_branch="West Palm Beach")
+        # Check availability, streaming each book's results to disk as one JSON object per line
+        with open(ndjson_path, 'wb', buffering=1 << 20) as ndjson_file:
+            def write_ndjson(book_results):
+                results.extend(book_results)
+                for book_result in book_results:
+                    ndjson_file.write(orjson.dumps(book_result, option=orjson.OPT_APPEND_NEWLINE))
+
+            if args.use_async:
+                asyncio.run(scraper.check_books_async(books, preferred_branch="West Palm Beach", on_results=write_ndjson))
+            else:
+                scraper.check_books(books, preferred_branch="West Palm Beach", on_results=write_ndjson)
+        report_log.info(f"\n✅ Results streamed to {ndjson_path}")
         
         # Display results
-        print("\n" + "="*50)
-        print("LIBRARY AVAILABILITY RESULTS")
-        print("="*50)
+        # Build the whole report first and log it as one record instead of one print per field
+        out = ["\n" + "="*50 + "\n", "LIBRARY AVAILABILITY RESULTS\n", "="*50 + "\n"]
+        matches = 0
         
+        _join = "\n".join
         for result in results:
-            print(f"\n--- {result['original_title']} by {result['original_author']} ---")
-            if result['found_title']:
-                print(f"Found: {result['found_title']} by {result['found_author']}")
-                print(f"Format: {result['format']}")
-                print(f"Availability: {result['availability']}")
-                if result['detail_link']:
-                    print(f"Link: {result['detail_link']}")
-                if result['branch_availability']:
-                    print("Branch availability:")
-                    for branch in result['branch_availability']:
-                        print(f"  - {branch['branch']}")
+            # Bind each field once per row rather than re-indexing the dict in every f-string
+            ot = result['original_title']
+            oa = result['original_author']
+            ft = result['found_title']
+            if ft:
+                matches += 1
+                dl = result['detail_link']
+                ba = result['branch_availability']
+                out.append(_FOUND_TMPL.format(ot, oa, ft, result['found_author'], result['format'], result['availability']))
+                if dl:
+                    out.append(_LINK_TMPL.format(dl))
+                if ba:
+                    out.append(_BRANCHES_TMPL.format(_join([f"  - {b['branch']}" for b in ba])))
             else:
-                print("❌ Not found in library system")
+                out.append(_NOTFOUND_TMPL.format(ot, oa))
         
-        # Save results to JSON file
-         
-        file = "PBSC" if choice == "1" else "Alachua"
-      
-
-        with open(f'data/{file}_availability.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        report_log.info("".join(out).rstrip("\n"))
         
-        print(f"\n✅ Results saved to data/{file}_availability.json")
-        print(f"📚 Checked {len(books)} books, found {len([r for r in results if r['found_title']])} matches")
+        # Save results to JSON file
+        if args.legacy_json:
+            save_results(results, json_path, pretty=args.pretty)
+            saved = True
+            report_log.info(f"\n✅ Results saved to {json_path}")
+        report_log.info(f"📚 Checked {len(books)} books, found {matches} matches")
         
     except KeyboardInterrupt:
-        print("\n⚠️  Script interrupted by user")
+        report_log.info("\n⚠️  Script interrupted by user")
     finally:
+        # Persist partial results if the run did not get as far as the normal save
+        if args.legacy_json and results and not saved:
+            save_results(results, json_path, pretty=args.pretty)
+            report_log.info(f"💾 Partial results ({len(results)}) saved to {json_path}")
+        report_buffer.flush()
         # Ensure cleanup
-        if hasattr(scraper, 'driver_pool'):
-            scraper.driver_pool.cleanup()
+        scraper.cleanup()
     
     end_time = time.time()
     execution_time = end_time - start_time
@@ -1,6 +1,12 @@
 
+import json
+import os
+import tempfile
+import time
 import unittest
+from unittest import mock
 from library_scraper import Book, GoodreadsExtractor, PBCLibraryScraper
+import library_scraper_threaded as threaded
 
 class TestGoodreadsExtractor(unittest.TestCase):
 
@@ -23,6 +29,10 @@ class TestGoodreadsExtractor(unittest.TestCase):
 class TestPBCLibraryScraper(unittest.TestCase):
 
     def setUp(self):
+        # None of these tests need a browser, so don't start ChromeDriver
+        patcher = mock.patch.object(PBCLibraryScraper, 'setup_selenium')
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.scraper = PBCLibraryScraper()
 
     def test_clean_title(self):
@@ -47,5 +57,164 @@ class TestPBCLibraryScraper(unittest.TestCase):
         self.assertIn("WEST BOYNTON BRANCH", branches)
         self.assertIn("TEQUESTA BRANCH", branches)
 
+    def test_fast_parser_matches_beautifulsoup(self):
+        html_content = """
+        <div class="cp-search-result-item-content">
+          <h2><a href="/v2/record/S40C1234567"><span class="title-content"> Educated <em>A Memoir</em></span></a></h2>
+          <span class="cp-author-link"><a>Westover, Tara</a></span>
+          <span class="cp-availability-status"> All copies in use </span>
+          <ul><li class="bib-field-value"> Book </li></ul>
+        </div>
+        """
+        book = Book(title="Educated", author="Tara Westover")
+        fast = PBCLibraryScraper(fast_parser=True)
+        self.assertTrue(fast.fast_parser)
+        slow = PBCLibraryScraper(fast_parser=False)
+        expected = [{
+            'title': "EducatedA Memoir",
+            'author': "Tara Westover",
+            'format': "Book",
+            'availability': "Unavailable",
+            'detail_link': "https://pbclibrary.bibliocommons.com/v2/record/S40C1234567"
+        }]
+        self.assertEqual(slow.parse_search_results(html_content, book), expected)
+        self.assertEqual(fast.parse_search_results(html_content, book), expected)
+
+class TestThreadedPBCLibraryScraper(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = threaded.PBCLibraryScraper(max_workers=1, use_cache=False)
+        self.addCleanup(self.scraper.cleanup)
+
+    def test_extract_branch_names(self):
+        tbody_text = """
+        WEST BOCA BRANCH - Available
+        MAIN LIBRARY
+        BOOKS BY MAIL - On shelf
+        West Palm Branch - Available
+        WEST BOCA BRANCH
+        123 NOT A BRANCH
+        """
+        branches = self.scraper.extract_branch_names(tbody_text)
+        self.assertEqual(branches, ["WEST BOCA BRANCH", "MAIN LIBRARY", "BOOKS BY MAIL"])
+
+    def test_parse_availability_json(self):
+        data = {'entities': {'bibItems': {
+            '1': {'branch': {'name': 'West Boca Branch'}, 'availability': {'statusType': 'AVAILABLE'}},
+            '2': {'branch': {'name': 'Tequesta Branch'}, 'availability': {'statusType': 'UNAVAILABLE'}},
+        }}}
+        self.assertEqual(self.scraper.parse_availability_json(data),
+                         ["Available", [{'branch': "WEST BOCA BRANCH"}]])
+
+    def test_parse_availability_json_unexpected_shape(self):
+        with self.assertRaises(ValueError):
+            self.scraper.parse_availability_json({'entities': {}})
+
+class TestThreadedAlachuaCountyLibraryScraper(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = threaded.AlachuaCountyLibraryScraper(max_workers=1, use_cache=False)
+        self.addCleanup(self.scraper.cleanup)
+
+    def test_clean_title_text(self):
+        clean = self.scraper.clean_title_text
+        self.assertEqual(clean("SomeTitle2Go"), "Some Title 2 Go")
+        self.assertEqual(clean("Beforethecoffeegetscold"), "Before Thecoffeegetscold")
+        self.assertEqual(clean("the lord of the rings"), "The Lord of the Rings")
+        self.assertEqual(clean("A Tale OF two cities"), "A Tale of Two Cities")
+
+    def search_row(self, availability):
+        return ('<div class="content-module content-module--search-result">'
+                '<span class="nsm-short-item nsm-e135">Title</span>'
+                '<div class="nsm-brief-standard-group"><span class="nsm-brief-label">Availability</span>'
+                f'{availability}</div></div>')
+
+    def test_parse_search_results_availability(self):
+        cases = [
+            ('<span class="nsm-short-item">2</span>', "Available"),
+            ('<span class="nsm-short-item">0</span>', "Unavailable"),
+            ('<span class="nsm-short-item">Available now</span>', "Available"),
+            ('<span class="nsm-short-item">Checked out</span>', "Unavailable"),
+            ('<span class="nsm-short-item">0 of 5 copies</span>', "Unavailable"),
+            ('<span class="nsm-short-item">On order</span>', "Unknown"),
+            ('<img src="/images/ajax-loader.gif">', "Loading"),
+        ]
+        book = threaded.Book(title="Title", author="Author")
+        for markup, expected in cases:
+            results = self.scraper.parse_search_results(self.search_row(markup), book)
+            self.assertEqual(results[0]['availability'], expected, markup)
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.scraper = threaded.PBCLibraryScraper(max_workers=1, use_cache=False)
+        self.addCleanup(self.scraper.cleanup)
+        self.scraper.cache_path = os.path.join(cache_dir.name, 'search_cache.json')
+        self.scraper.use_cache = True
+        self.scraper.cache_max_entries = 2
+
+    def result(self, availability="Available"):
+        return [{'title': "T", 'author': "A", 'format': "Book", 'availability': availability,
+                 'detail_link': None, 'branch_availability': []}]
+
+    def test_key_ignores_case_and_parentheses(self):
+        self.scraper.cache_search(threaded.Book(title="Dune (Book 1)", author="Frank Herbert"), self.result())
+        cached = self.scraper.get_cached_search(threaded.Book(title="dune", author="FRANK HERBERT "))
+        self.assertEqual(cached, self.result())
+
+    def test_least_recently_used_entry_is_dropped(self):
+        books = [threaded.Book(title=title, author="A") for title in ("One", "Two", "Three")]
+        self.scraper.cache_search(books[0], self.result())
+        self.scraper.cache_search(books[1], self.result())
+        self.scraper.get_cached_search(books[0])
+        self.scraper.cache_search(books[2], self.result())
+        self.assertIsNotNone(self.scraper.get_cached_search(books[0]))
+        self.assertIsNone(self.scraper.get_cached_search(books[1]))
+        self.assertIsNotNone(self.scraper.get_cached_search(books[2]))
+
+    def test_loading_results_are_not_cached(self):
+        book = threaded.Book(title="One", author="A")
+        self.scraper.cache_search(book, self.result("Loading"))
+        self.assertIsNone(self.scraper.get_cached_search(book))
+
+    def test_saved_cache_loads_back(self):
+        book = threaded.Book(title="One", author="A")
+        self.scraper.cache_search(book, self.result())
+        self.scraper.save_search_cache()
+        self.scraper._search_cache.clear()
+        self.scraper._load_search_cache()
+        self.assertEqual(self.scraper.get_cached_search(book), self.result())
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_capacity_is_available_at_once(self):
+        bucket = threaded.TokenBucket(interval=10, capacity=2)
+        self.addCleanup(bucket.stop)
+        start = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_spacing_paces_one_thread(self):
+        bucket = threaded.TokenBucket(interval=0.01, capacity=4, spacing=0.2)
+        self.addCleanup(bucket.stop)
+        start = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+class TestSaveResults(unittest.TestCase):
+
+    def test_round_trip(self):
+        results = [{'original_title': "Café", 'branch_availability': [{'branch': "MAIN LIBRARY"}]}]
+        with tempfile.TemporaryDirectory() as directory:
+            for pretty in (False, True):
+                path = os.path.join(directory, 'results.json')
+                threaded.save_results(results, path, pretty=pretty)
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), results)
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,6 +5,7 @@ import csv
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 import json
+from operator import itemgetter
 from dataclasses import dataclass
 from typing import List, Optional
 from selenium import webdriver
@@ -49,8 +50,7 @@ if __name__ == "__main__":
                 print(f"Link: {result['detail_link']}")
             if result['branch_availability']:
                 print("Branch availability:")
-                for branch in result['branch_availability']:
-                    print(f"{branch['branch']}")
+                print("\n".join([b['branch'] for b in result['branch_availability']]))
         else:
             print("❌ Not found in library system")
     
@@ -59,7 +59,7 @@ if __name__ == "__main__":
         json.dump(results, f, indent=2)
     
     print(f"\n✅ Results saved to library_availability_tests.json")
-    print(f"📚 Checked {len(books)} books, found {len([r for r in results if r['found_title']])} matches")
+    print(f"📚 Checked {len(books)} books, found {sum(map(bool, map(itemgetter('found_title'), results)))} matches")
     
     end_time = time.time()
     execution_time = end_time - start_time